@@ -0,0 +1,114 @@
+# coding: utf-8
+#
+
+import json
+
+import pytest
+
+import wda.actions
+from wda.actions import TouchActions, W3CActions
+
+
+def test_w3c_send_keys():
+    actions = W3CActions().send_keys("hi")
+    keyboard = actions.data[0]
+    assert keyboard["type"] == "key"
+    assert keyboard["actions"] == [
+        {"type": "keyDown", "value": "h"},
+        {"type": "keyUp", "value": "h"},
+        {"type": "keyDown", "value": "i"},
+        {"type": "keyUp", "value": "i"},
+    ]
+    json.dumps({"actions": actions.data})  # must be JSON serializable
+
+
+def test_w3c_tap():
+    finger = W3CActions().tap(10, 20).data[0]
+    assert finger["type"] == "pointer"
+    assert finger["actions"] == [
+        {"type": "pointerMove", "x": 10, "y": 20},
+        {"type": "pointerDown"},
+        {"type": "pointerUp"},
+    ]
+
+
+def test_w3c_swipe_with_duration():
+    finger = W3CActions().swipe(0, 0, 100, 200, swipe_seconds=0.5).data[0]
+    moves = [a for a in finger["actions"] if a["type"] == "pointerMove"]
+    assert len(moves) == 2
+    assert moves[1] == {"type": "pointerMove", "x": 100, "y": 200,
+                        "duration": 500.0}
+
+
+def test_w3c_swipe_without_duration():
+    finger = W3CActions().swipe(0, 0, 100, 200).data[0]
+    assert len(finger["actions"]) == 6
+    moves = [a for a in finger["actions"] if a["type"] == "pointerMove"]
+    assert len(moves) == 2  # no duplicated source move
+    assert "duration" not in moves[1]
+
+
+def test_w3c_unique_source_ids():
+    actions = W3CActions().tap(1, 2).send_keys("a").tap(3, 4)
+    ids = [source["id"] for source in actions.data]
+    assert ids == ["finger0", "keyboard0", "finger1"]
+
+
+def test_touch_swipe():
+    data = TouchActions().swipe(0, 0, 100, 0, swipe_seconds=1.0).data
+    assert data[0]["action"] == "press"
+    assert data[-1]["action"] == "release"
+    moves = [d for d in data if d["action"] == "moveTo"]
+    assert moves[-1]["options"]["x"] == 100
+    assert moves[-1]["options"]["y"] == 0
+    json.dumps({"actions": data})
+
+
+def test_touch_swipe_steps_capped():
+    # a 2000px swipe in 0.5s should not produce more moves than 60Hz allows
+    data = TouchActions().swipe(0, 0, 2000, 0, swipe_seconds=0.5).data
+    moves = [d for d in data if d["action"] == "moveTo"]
+    assert len(moves) <= 30
+    assert moves[-1]["options"]["x"] == 2000
+
+
+def test_w3c_from_gestures():
+    actions = W3CActions.from_gestures([
+        ("tap", {"x": 10, "y": 20}),
+        ("send_keys", {"text": "a"}),
+    ])
+    assert actions.data == W3CActions().tap(10, 20).send_keys("a").data
+    with pytest.raises(ValueError):
+        W3CActions.from_gestures([("pinch", {})])
+
+
+def test_to_json_cache():
+    actions = W3CActions().tap(1, 2)
+    first = actions.to_json()
+    assert actions.to_json() is first  # cached
+    assert json.loads(first) == actions.data
+    actions.tap(3, 4)
+    assert actions.to_json() is not first  # invalidated by mutation
+    assert json.loads(actions.to_json()) == actions.data
+
+
+def test_touch_swipe_prefer_w3c(monkeypatch):
+    monkeypatch.setattr(TouchActions, "PREFER_W3C", True)
+    data = TouchActions().swipe(0, 0, 2000, 0, swipe_seconds=0.5).data
+    assert len(data) == 1  # one W3C pointer source, no subdivided moves
+    assert data[0]["type"] == "pointer"
+
+
+def test_touch_swipe_tiny_distance():
+    # shorter than delta, int(distance / delta) is 0, must not raise
+    data = TouchActions().swipe(10, 10, 13, 10, swipe_seconds=0.5).data
+    moves = [d for d in data if d["action"] == "moveTo"]
+    assert moves
+    assert moves[-1]["options"]["x"] == 13
+
+
+def test_touch_swipe_without_numpy(monkeypatch):
+    data = TouchActions().swipe(0, 0, 100, 0, swipe_seconds=1.0).data
+    monkeypatch.setattr(wda.actions, "np", None)
+    fallback = TouchActions().swipe(0, 0, 100, 0, swipe_seconds=1.0).data
+    assert data == fallback
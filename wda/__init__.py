@@ -26,6 +26,7 @@ from deprecated import deprecated
 
 from wda import xcui_element_types
 from wda._proto import *
+from wda.actions import W3CActions, TouchActions
 from wda.exceptions import *
 from wda.usbmux import fetch
 from wda.usbmux.pyusbmux import list_devices, select_device
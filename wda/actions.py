@@ -0,0 +1,563 @@
+# coding: utf-8
+#
+# Gesture payload builders
+#
+# W3CActions builds the W3C actions API payload (POST /actions)
+# TouchActions builds the legacy Appium touch payload (POST /wda/touch/perform)
+#
+# Refs:
+#     https://www.w3.org/TR/webdriver/#actions
+#     https://github.com/appium/WebDriverAgent/blob/master/WebDriverAgentLib/Commands/FBW3CActionsCommands.m
+
+import json
+from math import hypot
+from typing import Optional
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+_POINTER_DOWN = {"type": "pointerDown"}
+_POINTER_UP = {"type": "pointerUp"}
+_TOUCH_RELEASE = {"action": "release"}
+_TOUCH_CANCEL = {"action": "cancel"}
+
+
+def _make_pointer_move(x, y, origin=None, duration=None) -> dict:
+    """
+    build a W3C pointerMove dict directly, without a FingerMovement object
+
+    Args:
+        duration: move duration in seconds
+    """
+    d = {"type": "pointerMove", "x": x, "y": y}
+    if origin is not None:
+        d["origin"] = origin
+    if duration is not None:
+        d["duration"] = duration * 1000  # wda needs milliseconds
+    return d
+
+
+def _interp(from_x, from_y, to_x, to_y, steps):
+    """
+    interpolated step coordinates (end point included), arithmetic only
+    so the dict building stays out of the numeric kernel
+
+    Returns:
+        (xs, ys): two lists of floats, both of length steps
+    """
+    dx = (to_x - from_x) / steps
+    dy = (to_y - from_y) / steps
+    if np is not None:
+        return (np.linspace(from_x + dx, to_x, steps).tolist(),
+                np.linspace(from_y + dy, to_y, steps).tolist())
+    xs = [0.0] * steps
+    ys = [0.0] * steps
+    cx, cy = float(from_x), float(from_y)
+    for i in range(steps):
+        cx += dx
+        cy += dy
+        xs[i] = cx
+        ys[i] = cy
+    return xs, ys
+
+
+def _build_options(x, y, element_uid=None, **extra) -> dict:
+    """ fully populated legacy options dict in one allocation """
+    options = {"x": x, "y": y, **extra}
+    if element_uid is not None:
+        options["element"] = element_uid
+    return options
+
+
+def _make_touch_move(x, y, element_uid=None) -> dict:
+    """ build a legacy moveTo dict directly, without a TouchMovement object """
+    return {"action": "moveTo", "options": _build_options(x, y, element_uid)}
+
+
+class _MovementMixin(object):
+    """
+    shared with_xy/with_origin for the movement builders
+
+    Concrete classes define _opts() returning the dict the coordinates go
+    into, so all builders share a single method object per operation.
+    """
+
+    __slots__ = ()
+
+    _origin_key = "element"
+
+    def with_xy(self, x, y):
+        opts = self._opts()
+        opts["x"] = x
+        opts["y"] = y
+        return self
+
+    def with_origin(self, element_uid: Optional[str]):
+        """
+        Args:
+            element_uid: act relative to element, None means viewport
+        """
+        if element_uid is not None:
+            self._opts()[self._origin_key] = element_uid
+        return self
+
+
+class _PressureMixin(object):
+    """ shared with_pressure for press style builders """
+
+    __slots__ = ()
+
+    def with_pressure(self, pressure: float):
+        self._opts()["pressure"] = pressure
+        return self
+
+
+class _ConfigureMixin(object):
+    """ one-shot alternative to the with_* builder chain """
+
+    __slots__ = ()
+
+    @classmethod
+    def configure(cls, x, y, element_uid=None, **extra) -> dict:
+        """
+        build the finished action dict in a single call, without
+        allocating a builder object:
+
+            TouchTap.configure(100, 200) ==
+                TouchTap().with_xy(100, 200).data
+        """
+        return {
+            "action": cls._action,
+            "options": _build_options(x, y, element_uid, **extra),
+        }
+
+
+class FingerMovement(_MovementMixin):
+    """ builder of a single W3C pointerMove action """
+
+    __slots__ = ("_data",)
+
+    _origin_key = "origin"
+
+    def __init__(self):
+        self._data = {}
+
+    def _opts(self) -> dict:
+        return self._data
+
+    def with_duration(self, seconds: float):
+        self._data["duration"] = seconds
+        return self
+
+    @property
+    def data(self) -> dict:
+        d = self._data
+        return _make_pointer_move(d.get("x"), d.get("y"), d.get("origin"),
+                                  d.get("duration"))
+
+
+class FingerAction(object):
+    """ action sequence of one finger (one W3C pointer input source) """
+
+    __slots__ = ("_data",)
+
+    def __init__(self):
+        self._data = []
+
+    def move(self, movement: FingerMovement):
+        self._data.append(movement.data)
+        return self
+
+    def down(self):
+        self._data.append(_POINTER_DOWN.copy())
+        return self
+
+    def up(self):
+        self._data.append(_POINTER_UP.copy())
+        return self
+
+    def pause(self, seconds: float):
+        """
+        W3C wart: a pause placed between two pointerMoves is consumed by the
+        following move, so move(a) pause(1) move(b) means "move from a to b
+        in one second", not "stay at a for one second".
+        """
+        self._data.append({"type": "pause", "duration": seconds * 1000})
+        return self
+
+    @property
+    def data(self) -> list:
+        return list(self._data)
+
+
+class W3CActions(object):
+    """
+    Payload builder for POST /session/$sessionId/actions
+
+    Example:
+        actions = W3CActions().tap(100, 200).send_keys("hello")
+        actions.perform(client)
+    """
+
+    __slots__ = ("_data", "_json_cache", "_kbd_seq", "_finger_seq")
+
+    def __init__(self):
+        self._data = []
+        self._json_cache = None
+        # id sequences are tracked separately so mixed keyboard/pointer
+        # sources never share an id suffix
+        self._kbd_seq = 0
+        self._finger_seq = 0
+
+    @classmethod
+    def from_gestures(cls, gestures):
+        """
+        batch builder for high-throughput scenarios
+
+        Args:
+            gestures: iterable of (kind, params) tuples, kind is one of
+                "tap", "press", "swipe", "send_keys"
+
+        Example:
+            W3CActions.from_gestures([
+                ("tap", {"x": 10, "y": 20}),
+                ("swipe", {"from_x": 0, "from_y": 0,
+                           "to_x": 100, "to_y": 0, "swipe_seconds": 0.5}),
+                ("send_keys", {"text": "hello"}),
+            ])
+
+        Raises:
+            ValueError when kind is unknown
+        """
+        inst = cls()
+        dispatch = {
+            "tap": inst.tap,
+            "press": inst.press,
+            "swipe": inst.swipe,
+            "send_keys": inst.send_keys,
+        }
+        for kind, params in gestures:
+            fn = dispatch.get(kind)
+            if fn is None:
+                raise ValueError("unknown gesture kind: %r" % (kind, ))
+            fn(**params)
+        return inst
+
+    def perform(self, client):
+        """
+        Args:
+            client: wda.Client
+        """
+        return client._session_http.post('/actions', {'actions': self.data})
+
+    def send_keys(self, text: str):
+        """ type text through a W3C key input source """
+        # build a flat list directly, generators are not JSON serializable
+        actions = []
+        append = actions.append
+        for v in text:
+            append({"type": "keyDown", "value": v})
+            append({"type": "keyUp", "value": v})
+        kid = self._kbd_seq
+        self._kbd_seq = kid + 1
+        self._json_cache = None
+        self._data.append({
+            "type": "key",
+            "id": "keyboard%d" % kid,
+            "actions": actions,
+        })
+        return self
+
+    def inject_touch_actions(self, action: FingerAction):
+        """ add one finger (pointer input source) """
+        return self._inject_pointer_actions(action.data)
+
+    def _inject_pointer_actions(self, actions: list):
+        fid = self._finger_seq
+        self._finger_seq = fid + 1
+        self._json_cache = None
+        self._data.append({
+            "type": "pointer",
+            "id": "finger%d" % fid,
+            "parameters": {"pointerType": "touch"},
+            "actions": actions,
+        })
+        return self
+
+    def tap(self, x, y, element_uid: Optional[str] = None):
+        return self._inject_pointer_actions([
+            _make_pointer_move(x, y, element_uid),
+            _POINTER_DOWN.copy(),
+            _POINTER_UP.copy(),
+        ])
+
+    def press(self, x, y, press_seconds: float = 1.0, element_uid: Optional[str] = None):
+        return self._inject_pointer_actions([
+            _make_pointer_move(x, y, element_uid),
+            _POINTER_DOWN.copy(),
+            {"type": "pause", "duration": press_seconds * 1000},
+            _POINTER_UP.copy(),
+        ])
+
+    def swipe(self,
+              from_x, from_y, to_x, to_y,
+              press_seconds: float = 0.1,
+              swipe_seconds: Optional[float] = None,
+              hold_seconds: float = 0.1,
+              element_uid: Optional[str] = None):
+        """
+        Args:
+            press_seconds: hold time before moving
+            swipe_seconds: move duration, None means move as fast as possible
+            hold_seconds: hold time before releasing
+        """
+        if swipe_seconds is not None:
+            # the spec honors duration directly on pointerMove, no need
+            # for the pause + duplicated move dance (see FingerAction.pause)
+            return self._inject_pointer_actions([
+                _make_pointer_move(from_x, from_y, element_uid),
+                _POINTER_DOWN.copy(),
+                {"type": "pause", "duration": press_seconds * 1000},
+                _make_pointer_move(to_x, to_y, element_uid, swipe_seconds),
+                {"type": "pause", "duration": hold_seconds * 1000},
+                _POINTER_UP.copy(),
+            ])
+        # no duration: move straight to the end point, a duplicated
+        # source move would only pad the payload (see FingerAction.pause)
+        return self._inject_pointer_actions([
+            _make_pointer_move(from_x, from_y, element_uid),
+            _POINTER_DOWN.copy(),
+            {"type": "pause", "duration": press_seconds * 1000},
+            _make_pointer_move(to_x, to_y, element_uid),
+            {"type": "pause", "duration": hold_seconds * 1000},
+            _POINTER_UP.copy(),
+        ])
+
+    @property
+    def data(self) -> list:
+        """ the internal action list, callers must not mutate it """
+        return self._data
+
+    def to_json(self) -> str:
+        """ compact JSON of the payload, cached until the next mutation """
+        if self._json_cache is None:
+            self._json_cache = json.dumps(self._data, separators=(",", ":"))
+        return self._json_cache
+
+
+class TouchMovement(_MovementMixin, _ConfigureMixin):
+    """ builder of a single legacy moveTo action """
+
+    __slots__ = ("_data",)
+
+    _action = "moveTo"
+
+    def __init__(self):
+        self._data = {"action": self._action, "options": {}}
+
+    def _opts(self) -> dict:
+        return self._data["options"]
+
+    @property
+    def data(self) -> dict:
+        return dict(self._data)
+
+
+class TouchPress(_MovementMixin, _PressureMixin, _ConfigureMixin):
+    """ builder of a single legacy press action """
+
+    __slots__ = ("_data",)
+
+    _action = "press"
+
+    def __init__(self):
+        self._data = {"action": self._action, "options": {}}
+
+    def _opts(self) -> dict:
+        return self._data["options"]
+
+    @property
+    def data(self) -> dict:
+        return dict(self._data)
+
+
+class TouchLongPress(_MovementMixin, _PressureMixin, _ConfigureMixin):
+    """ builder of a single legacy longPress action """
+
+    __slots__ = ("_data",)
+
+    _action = "longPress"
+
+    def __init__(self):
+        self._data = {"action": self._action, "options": {}}
+
+    def _opts(self) -> dict:
+        return self._data["options"]
+
+    @property
+    def data(self) -> dict:
+        return dict(self._data)
+
+
+class TouchTap(_MovementMixin, _ConfigureMixin):
+    """ builder of a single legacy tap action """
+
+    __slots__ = ("_data",)
+
+    _action = "tap"
+
+    def __init__(self):
+        self._data = {"action": self._action, "options": {}}
+
+    def _opts(self) -> dict:
+        return self._data["options"]
+
+    @property
+    def data(self) -> dict:
+        return dict(self._data)
+
+
+class TouchActions(object):
+    """
+    Payload builder for POST /session/$sessionId/wda/touch/perform
+
+    Example:
+        actions = TouchActions().swipe(100, 500, 100, 100, swipe_seconds=0.5)
+        actions.perform(client)
+
+    Set PREFER_W3C = True to let swipe() build a single W3C pointerMove
+    (interpolated device-side) instead of subdivided legacy moves. A
+    payload built this way is sent to /actions and must not be mixed
+    with legacy touch actions.
+    """
+
+    __slots__ = ("_data", "_json_cache", "_use_w3c")
+
+    PREFER_W3C = False
+
+    def __init__(self):
+        self._data = []
+        self._json_cache = None
+        self._use_w3c = False
+
+    def perform(self, client):
+        """
+        Args:
+            client: wda.Client
+        """
+        if self._use_w3c:
+            return client._session_http.post('/actions',
+                                             {'actions': self.data})
+        return client._session_http.post('/wda/touch/perform',
+                                         {'actions': self.data})
+
+    def tap(self, x, y, element_uid: Optional[str] = None):
+        self._json_cache = None
+        self._data.append(TouchTap.configure(x, y, element_uid))
+        return self
+
+    def press(self, x, y, element_uid: Optional[str] = None):
+        self._json_cache = None
+        self._data.append(TouchPress.configure(x, y, element_uid))
+        return self
+
+    def move(self, x, y, element_uid: Optional[str] = None):
+        self._json_cache = None
+        self._data.append(TouchMovement.configure(x, y, element_uid))
+        return self
+
+    def pause(self, seconds: float):
+        self._json_cache = None
+        self._data.append({"action": "wait", "options": {"ms": seconds * 1000}})
+        return self
+
+    def up(self):
+        """ release the finger """
+        self._json_cache = None
+        self._data.append(_TOUCH_RELEASE.copy())
+        return self
+
+    def cancel(self):
+        self._json_cache = None
+        self._data.append(_TOUCH_CANCEL.copy())
+        return self
+
+    def swipe(self,
+              from_x, from_y, to_x, to_y,
+              press_seconds: float = 0.1,
+              swipe_seconds: Optional[float] = None,
+              hold_seconds: float = 0.1,
+              delta: int = 10,
+              element_uid: Optional[str] = None):
+        """
+        Args:
+            press_seconds: hold time before moving
+            swipe_seconds: move duration, None means jump to end point directly
+            hold_seconds: hold time before releasing
+            delta: pixel distance between two interpolated move points
+
+        The legacy touch API does not interpolate moves device-side, so a
+        smooth swipe is emulated by subdividing the move into small steps.
+        With PREFER_W3C set the subdivision is skipped entirely: a single
+        pointerMove with duration is interpolated by the device at its
+        native sampling rate.
+        """
+        if self.PREFER_W3C:
+            w3c = W3CActions().swipe(from_x, from_y, to_x, to_y,
+                                     press_seconds=press_seconds,
+                                     swipe_seconds=swipe_seconds,
+                                     hold_seconds=hold_seconds,
+                                     element_uid=element_uid)
+            self._json_cache = None
+            self._data.extend(w3c.data)
+            self._use_w3c = True
+            return self
+        self._json_cache = None
+        self._data.append(TouchPress.configure(from_x, from_y, element_uid))
+        if press_seconds:
+            self.pause(press_seconds)
+        if not swipe_seconds:
+            self._data.append(_make_touch_move(to_x, to_y, element_uid))
+        else:
+            distance = hypot(to_x - from_x, to_y - from_y)
+            # never emit more moves than the ~60Hz touch pipeline can
+            # consume within swipe_seconds, a long swipe does not need
+            # one point per delta pixels; the lower bound also guards the
+            # divisions below when distance < delta makes int() yield 0
+            steps = max(2, min(int(distance / delta), int(swipe_seconds * 60)))
+            interval = float(swipe_seconds) / steps
+            origin = {"element": element_uid} if element_uid is not None else {}
+            # interval is constant across the loop, build the pause dict once
+            # and copy per step (shallow copy is fine, "options" is never
+            # mutated downstream)
+            pause_tpl = {"action": "wait", "options": {"ms": interval * 1000}}
+            xs, ys = _interp(from_x, from_y, to_x, to_y, steps)
+            # the step list is pre-sized and merged with one extend instead
+            # of growing self._data 2*steps times
+            local = [None] * (2 * steps)
+            idx = 0
+            for x, y in zip(xs, ys):
+                local[idx] = {
+                    "action": "moveTo",
+                    "options": {"x": x, "y": y, **origin}
+                }
+                local[idx + 1] = pause_tpl.copy()
+                idx += 2
+            self._data.extend(local)
+        if hold_seconds:
+            self.pause(hold_seconds)
+        return self.up()
+
+    @property
+    def data(self) -> list:
+        """ the internal action list, callers must not mutate it """
+        return self._data
+
+    def to_json(self) -> str:
+        """ compact JSON of the payload, cached until the next mutation """
+        if self._json_cache is None:
+            self._json_cache = json.dumps(self._data, separators=(",", ":"))
+        return self._json_cache